@@ -83,7 +83,7 @@ EOF
 
     # Install additional requirements
     # We install them in Dockerfile but ensure here too just in case
-    pip install runpod>=1.6.0 boto3>=1.26.0
+    pip install "runpod>=1.6.0" "boto3>=1.26.0" "msgspec>=0.18.0" "orjson>=3.9.0"
 
     # Install LinaCodec for streaming support
     echo "Installing LinaCodec..."
@@ -101,15 +101,24 @@ else
     # Runtime check: Ensure LinaCodec is available
     # This handles cases where persistent volumes might override the image's python environment
     python << 'EOF'
+import subprocess
 import sys
 try:
     from linacodec.codec import LinaCodec
     print("LinaCodec is available")
 except ImportError:
     print("LinaCodec not found, installing...")
-    import subprocess
     subprocess.check_call([sys.executable, "-m", "pip", "install", "git+https://github.com/ysharma3501/LinaCodec.git"])
     print("LinaCodec installed successfully")
+
+# Volumes provisioned before these handler dependencies were added won't have them yet
+for module, requirement in (("msgspec", "msgspec>=0.18.0"), ("orjson", "orjson>=3.9.0")):
+    try:
+        __import__(module)
+    except ImportError:
+        print(f"{module} not found, installing...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", requirement])
+        print(f"{module} installed successfully")
 EOF
 fi
 
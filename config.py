@@ -15,6 +15,10 @@ S3_ACCESS_KEY_ID = os.environ.get("S3_ACCESS_KEY_ID")
 S3_SECRET_ACCESS_KEY = os.environ.get("S3_SECRET_ACCESS_KEY")
 S3_BUCKET_NAME = os.environ.get("S3_BUCKET_NAME")
 S3_REGION = os.environ.get("S3_REGION", "us-east-1")
+S3_ADDRESSING_STYLE = os.environ.get("S3_ADDRESSING_STYLE", "auto")  # "auto", "virtual" or "path" (MinIO/IP endpoints need path)
+S3_PUBLIC_URL = os.environ.get("S3_PUBLIC_URL")  # Base URL of a public-read bucket; skips presigning when set
+S3_PRESIGNED_EXPIRY = int(os.environ.get("S3_PRESIGNED_EXPIRY", "3600"))  # seconds
+S3_UPLOAD_TIMEOUT = float(os.environ.get("S3_UPLOAD_TIMEOUT", "120"))  # seconds to wait for a background upload
 
 # Runpod volume structure
 RUNPOD_VOLUME = "/runpod-volume"
@@ -22,8 +26,10 @@ CHATTERBOX_DIR = f"{RUNPOD_VOLUME}/chatterbox"
 MODEL_CACHE_DIR = f"{CHATTERBOX_DIR}/models"
 OUTPUT_DIR = f"{CHATTERBOX_DIR}/output"
 AUDIO_PROMPTS_DIR = f"{CHATTERBOX_DIR}/audio_prompts"  # For voice cloning reference audio
+PERSIST_LOCAL_COPY = os.environ.get("PERSIST_LOCAL_COPY", "0") == "1"  # Also write S3 outputs to OUTPUT_DIR
 
 # Application Configuration
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()  # Set to DEBUG for per-step handler logs, WARNING to quiet them
 MAX_TEXT_LENGTH = int(os.environ.get("MAX_TEXT_LENGTH", "2000"))
 DEFAULT_SAMPLE_RATE = int(os.environ.get("DEFAULT_SAMPLE_RATE", "24000")) # Used for librosa loading
 MAX_CHUNK_CHARS = int(os.environ.get("MAX_CHUNK_CHARS", "300")) # Max chars per chunk (official demo uses 300, tested up to 550)
@@ -33,6 +39,32 @@ AUDIO_EXTS = {".wav", ".mp3", ".m4a", ".ogg", ".flac", ".webm", ".aac", ".opus"}
 MIN_AUDIO_DURATION = 3.0  # seconds
 MAX_AUDIO_DURATION = 30.0  # seconds
 
+# PyTorch configuration
+# CUDA caching allocator settings (applied before CUDA init); expandable segments
+# avoid fragmentation from the variable-length allocations of each generate() call
+# (roundup_power2_divisions also reduces internal fragmentation of rounded-up blocks)
+PYTORCH_CUDA_ALLOC_CONF = os.environ.get(
+    "PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True,max_split_size_mb:128,roundup_power2_divisions:8"
+)
+# Autocast precision for model calls on CUDA: auto (bf16 if supported, else fp16), bfloat16, float16, float32 (off)
+INFERENCE_DTYPE = os.environ.get("INFERENCE_DTYPE", "auto").lower()
+# Store T3 transformer weights in the autocast dtype (S3Gen vocoder weights stay FP32)
+T3_HALF_WEIGHTS = os.environ.get("T3_HALF_WEIGHTS", "1") == "1"
+# torch.compile for the T3 decoder and S3Gen flow estimator (opt-in: compilation adds to cold-start time)
+TORCH_COMPILE = os.environ.get("TORCH_COMPILE", "0") == "1"
+TORCH_COMPILE_MODE = os.environ.get("TORCH_COMPILE_MODE", "reduce-overhead")
+# Preallocated T3 KV cache length in tokens (prompt + inference_turbo's max_gen_len speech tokens; 0 disables).
+# On by default only with TORCH_COMPILE: eager attention over the full masked buffer is slower than torch.cat
+T3_KV_CACHE_LEN = int(os.environ.get("T3_KV_CACHE_LEN", "2048" if TORCH_COMPILE else "0"))
+# Seconds without a job before cached GPU memory is returned to the driver (0 disables; opt-in because the
+# next job pays cudaMalloc again, undoing the allocator warmup)
+GPU_IDLE_RELEASE_SEC = float(os.environ.get("GPU_IDLE_RELEASE_SEC", "0"))
+MODEL_WARMUP_RUNS = int(os.environ.get("MODEL_WARMUP_RUNS", "2"))  # Short generations after model load (0 disables)
+
+# Voice conditionals cache (prepared audio prompts, keyed by path, mtime and size)
+COND_CACHE_SIZE = int(os.environ.get("COND_CACHE_SIZE", "32"))  # entries
+COND_CACHE_TTL = int(os.environ.get("COND_CACHE_TTL", "3600"))  # seconds
+
 # ChatterBox Turbo generation parameters
 DEFAULT_EXAGGERATION = 0.0  # Emotion/expressiveness (0.0-1.0, ignored by Turbo)
 DEFAULT_CFG_WEIGHT = 0.0    # Classifier-free guidance weight (0.0-1.0, ignored by Turbo)
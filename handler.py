@@ -3,23 +3,139 @@ import os
 import logging
 import base64
 import io
+import json
+import queue
 import uuid
+import random
+import msgspec
 import soundfile as sf
-import boto3
-from botocore.exceptions import NoCredentialsError
+import numpy as np
+import torch
+import threading
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Optional, Union
+from urllib.parse import quote
 
-from inference import ChatterBoxInference
+from inference import ChatterBoxInference, LINACODEC_AVAILABLE, load_linacodec
 import config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (LogRecords skip thread/process introspection)
+logging.logThreads = False
+logging.logProcesses = False
+_LOG_LEVEL = logging.getLevelName(config.LOG_LEVEL)
+logging.basicConfig(level=_LOG_LEVEL if isinstance(_LOG_LEVEL, int) else logging.INFO)
 log = logging.getLogger(__name__)
+if not isinstance(_LOG_LEVEL, int):
+    log.warning("Invalid LOG_LEVEL %r, using INFO", config.LOG_LEVEL)
+
+# orjson serializes large responses (e.g. base64 audio) several times faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    log.warning("orjson not available, job results will be serialized with stdlib json")
 
 # Initialize model loader
 inference_engine = ChatterBoxInference()
 
+# Ensure output directory exists once (it should be created by bootstrap, but good for safety)
+try:
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+except OSError as e:
+    log.warning("Could not create output directory %s: %s", config.OUTPUT_DIR, e)
+
+# Non-cryptographic RNG for filename tags; session_id carries the real identity
+_rng = random.Random(os.urandom(32))
+
+# S3 client is shared across jobs so warm workers reuse its connection pool
+_S3_CLIENT = None
+_S3_CLIENT_LOCK = threading.Lock()
+
+# Multipart parts are uploaded in the background while encoding continues
+_UPLOAD_WORKERS = 4
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=_UPLOAD_WORKERS, thread_name_prefix="s3-upload")
+
+# Output cleanup runs in the background at most once per interval
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleanup")
+_CLEANUP_INTERVAL = 600  # seconds
+_LAST_CLEANUP = 0.0
+
+# Cached GPU memory is released once the worker has sat idle for a while
+_IDLE_TIMER = None
+_IDLE_TIMER_LOCK = threading.Lock()
+
+# Reusable encode buffers, so warm workers don't reallocate multi-MB outputs per job
+_AUDIO_BUF_POOL = queue.SimpleQueue()
+
+# Batch output formats: output_format -> (soundfile format, subtype, content type, streamable)
+# Streamable formats are written front-to-back and can be encoded straight into S3;
+# WAV/FLAC rewrite their headers on close, so they are encoded in memory first.
+_AUDIO_FORMATS = {
+    "ogg": ("OGG", "VORBIS", "audio/ogg", True),
+    "wav": ("WAV", "PCM_16", "audio/wav", False),
+    "flac": ("FLAC", "PCM_16", "audio/flac", False),
+}
+
+
+class _OrjsonShim:
+    """Stand-in for the `json` module inside runpod's result transmitter"""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson always emits UTF-8 (the ensure_ascii=False behaviour runpod asks for)
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+
+def _install_orjson_serializer():
+    """Make runpod serialize job results with orjson instead of stdlib json"""
+    if not ORJSON_AVAILABLE:
+        return
+
+    try:
+        from runpod.serverless.modules import rp_http
+        rp_http.json = _OrjsonShim()
+        log.info("Job results will be serialized with orjson")
+    except (ImportError, AttributeError) as e:
+        log.warning("Could not install orjson serializer: %s", e)
+
+def _fast_id():
+    """Return a random 32-char hex tag without a /dev/urandom read per call"""
+    return _rng.randbytes(16).hex()
+
+def _get_s3_client():
+    """Return the module-level S3 client, creating it on first use
+
+    boto3 is imported here so base64-only deployments never load botocore.
+    """
+    global _S3_CLIENT
+
+    if _S3_CLIENT is not None:
+        return _S3_CLIENT
+
+    with _S3_CLIENT_LOCK:
+        if _S3_CLIENT is None:
+            import boto3
+            from botocore.config import Config
+
+            _S3_CLIENT = boto3.client(
+                's3',
+                endpoint_url=config.S3_ENDPOINT_URL,
+                aws_access_key_id=config.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=config.S3_SECRET_ACCESS_KEY,
+                region_name=config.S3_REGION,
+                config=Config(
+                    max_pool_connections=32,
+                    retries={'mode': 'adaptive', 'max_attempts': 5},
+                    s3={'addressing_style': config.S3_ADDRESSING_STYLE}
+                )
+            )
+    return _S3_CLIENT
+
 def cleanup_old_files(directory, days=2):
     """Delete files older than specified days from directory
 
@@ -28,62 +144,324 @@ def cleanup_old_files(directory, days=2):
         days: Age threshold in days (default: 2)
     """
     try:
-        output_dir = Path(directory)
-        if not output_dir.exists():
-            log.debug(f"Output directory {directory} does not exist, skipping cleanup")
+        if not os.path.isdir(directory):
+            log.debug("Output directory %s does not exist, skipping cleanup", directory)
             return
 
         current_time = time.time()
         cutoff_time = current_time - (days * 24 * 60 * 60)  # Convert days to seconds
 
         deleted_count = 0
-        for file_path in output_dir.glob('*'):
-            if file_path.is_file():
-                file_age = file_path.stat().st_mtime
-                if file_age < cutoff_time:
-                    try:
-                        file_path.unlink()
-                        deleted_count += 1
-                        log.debug(f"Deleted old file: {file_path.name}")
-                    except Exception as e:
-                        log.warning(f"Failed to delete {file_path.name}: {e}")
+        # scandir entries carry cached stat info, so each file costs a single syscall
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_age = entry.stat().st_mtime
+                    if file_age < cutoff_time:
+                        try:
+                            os.unlink(entry.path)
+                            deleted_count += 1
+                            log.debug("Deleted old file: %s", entry.name)
+                        except Exception as e:
+                            log.warning("Failed to delete %s: %s", entry.name, e)
 
         if deleted_count > 0:
-            log.info(f"Cleaned up {deleted_count} files older than {days} days from {directory}")
+            log.info("Cleaned up %d files older than %s days from %s", deleted_count, days, directory)
     except Exception as e:
-        log.error(f"Cleanup failed: {e}")
+        log.error("Cleanup failed: %s", e)
+
+def _release_idle_gpu_memory():
+    """Return cached allocator blocks to the driver (runs on the idle timer thread)
+
+    Holds _IDLE_TIMER_LOCK throughout, so a job starting meanwhile waits in
+    _cancel_idle_release instead of overlapping the device sync; a timer that
+    was cancelled or replaced after it fired does nothing.
+    """
+    global _IDLE_TIMER
+
+    with _IDLE_TIMER_LOCK:
+        # The Timer is the thread running this callback
+        if threading.current_thread() is not _IDLE_TIMER:
+            return
+        _IDLE_TIMER = None
+        torch.cuda.empty_cache()
+    log.debug("Released cached GPU memory after idle period")
+
+
+def _cancel_idle_release():
+    """Disarm the idle timer when a job starts"""
+    global _IDLE_TIMER
+
+    with _IDLE_TIMER_LOCK:
+        if _IDLE_TIMER is not None:
+            _IDLE_TIMER.cancel()
+            _IDLE_TIMER = None
+
+
+def _schedule_idle_release():
+    """Arm the idle timer when a job finishes (empty_cache synchronizes the device,
+    so it never runs on the request path)"""
+    global _IDLE_TIMER
+
+    if config.GPU_IDLE_RELEASE_SEC <= 0 or not torch.cuda.is_available():
+        return
+
+    with _IDLE_TIMER_LOCK:
+        if _IDLE_TIMER is not None:
+            _IDLE_TIMER.cancel()
+        _IDLE_TIMER = threading.Timer(config.GPU_IDLE_RELEASE_SEC, _release_idle_gpu_memory)
+        _IDLE_TIMER.daemon = True
+        _IDLE_TIMER.start()
+
+
+def schedule_cleanup(directory, days=2):
+    """Queue cleanup_old_files on the background pool if the interval has elapsed"""
+    global _LAST_CLEANUP
+
+    now = time.time()
+    if now - _LAST_CLEANUP > _CLEANUP_INTERVAL:
+        _LAST_CLEANUP = now
+        _CLEANUP_POOL.submit(cleanup_old_files, directory, days)
+
+class AudioBuffer:
+    """Seekable in-memory file backed by a reusable bytearray
+
+    Unlike BytesIO, reset() keeps the allocation, so pooled buffers stop
+    reallocating once they have grown to a typical output size.
+    """
+
+    def __init__(self, capacity=2 * 1024 * 1024):
+        self._data = bytearray(capacity)
+        self._length = 0
+        self._position = 0
+
+    def write(self, data):
+        size = len(data)
+        end = self._position + size
+        if end > len(self._data):
+            # Grow geometrically so repeated small writes stay amortized O(1)
+            self._data.extend(bytes(max(end, 2 * len(self._data)) - len(self._data)))
+        self._data[self._position:end] = data
+        self._position = end
+        self._length = max(self._length, end)
+        return size
+
+    def read(self, size=-1):
+        end = self._length if size < 0 else min(self._length, self._position + size)
+        data = bytes(self._data[self._position:end])
+        self._position = max(self._position, end)
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = self._length + offset
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def getbuffer(self):
+        """Zero-copy view of the bytes written so far"""
+        return memoryview(self._data)[:self._length]
+
+    def reset(self):
+        self._length = 0
+        self._position = 0
+
+def _acquire_audio_buffer():
+    """Take an AudioBuffer from the pool, or create one if the pool is empty"""
+    try:
+        audio_buffer = _AUDIO_BUF_POOL.get_nowait()
+    except queue.Empty:
+        return AudioBuffer()
+    audio_buffer.reset()
+    return audio_buffer
+
+def _release_audio_buffer(audio_buffer):
+    """Return an AudioBuffer to the pool for the next job"""
+    _AUDIO_BUF_POOL.put(audio_buffer)
+
+class S3MultipartWriter:
+    """Write-only file object that streams bytes into an S3 multipart upload
+
+    soundfile encodes straight into this object. Bytes are buffered until a
+    full part is available, which is then uploaded on the background pool, so
+    at most a few parts are held in memory regardless of audio duration.
+    The multipart upload is only created once the first full part is ready;
+    outputs smaller than a part (most of them) go up with a single PutObject.
+    An optional `tee` file receives the same bytes for local persistence.
+    """
 
-def upload_to_s3(audio_buffer, filename):
-    """Upload generated audio to S3 and return URL"""
+    PART_SIZE = 5 * 1024 * 1024  # S3 minimum size for all but the last part
+
+    def __init__(self, s3, bucket, key, content_type, tee=None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.tee = tee
+        self.upload_id = None  # Created with the first full part
+        self._buffer = bytearray()
+        self._position = 0
+        self._pending = []  # (part_number, future)
+
+    def write(self, data):
+        data = bytes(data)
+        self._buffer += data
+        self._position += len(data)
+        if self.tee is not None:
+            self.tee.write(data)
+        while len(self._buffer) >= self.PART_SIZE:
+            self._submit_part(bytes(self._buffer[:self.PART_SIZE]))
+            del self._buffer[:self.PART_SIZE]
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # The stream is append-only; only allow "seeks" that land on the current end
+        target = offset if whence == io.SEEK_SET else self._position + offset
+        if target != self._position:
+            raise io.UnsupportedOperation("S3MultipartWriter does not support seeking")
+        return self._position
+
+    def _submit_part(self, body):
+        if self.upload_id is None:
+            self.upload_id = self.s3.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self.content_type
+            )['UploadId']
+
+        # Bound memory: wait for the oldest in-flight part before queueing more
+        in_flight = [future for _, future in self._pending if not future.done()]
+        if len(in_flight) >= _UPLOAD_WORKERS:
+            in_flight[0].result(timeout=config.S3_UPLOAD_TIMEOUT)
+
+        part_number = len(self._pending) + 1
+        future = _UPLOAD_POOL.submit(
+            self.s3.upload_part,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        self._pending.append((part_number, future))
+
+    def complete(self):
+        """Flush the final part and complete the multipart upload (or PutObject if it never started)"""
+        if not self._pending:
+            self.s3.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), ContentType=self.content_type
+            )
+            self._buffer.clear()
+            return
+
+        if self._buffer:
+            self._submit_part(bytes(self._buffer))
+            self._buffer.clear()
+
+        parts = [
+            {'PartNumber': part_number, 'ETag': future.result(timeout=config.S3_UPLOAD_TIMEOUT)['ETag']}
+            for part_number, future in self._pending
+        ]
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+
+    def abort(self):
+        """Abort the multipart upload so S3 discards any uploaded parts"""
+        if self.upload_id is None:
+            return
+        try:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        except Exception as e:
+            log.warning("Failed to abort multipart upload for %s: %s", self.key, e)
+
+def build_audio_url(s3, key, content_type):
+    """Return the URL clients use to fetch an uploaded object
+
+    Public buckets (S3_PUBLIC_URL set) get a plain URL with no signing work;
+    otherwise a presigned GET URL is generated with the shared client, which
+    reuses its cached SigV4 signing key across requests. Presigned URLs carry
+    the response Content-Type/Content-Disposition, so clients don't need a HEAD.
+    """
+    if config.S3_PUBLIC_URL:
+        return f"{config.S3_PUBLIC_URL.rstrip('/')}/{quote(key)}"
+
+    # Generate presigned URL
+    return s3.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': config.S3_BUCKET_NAME,
+            'Key': key,
+            'ResponseContentType': content_type,
+            # RFC 6266 extended form: the key is percent-encoded, never raw client text in the header
+            'ResponseContentDisposition': f"attachment; filename*=UTF-8''{quote(key)}"
+        },
+        ExpiresIn=config.S3_PRESIGNED_EXPIRY,
+        HttpMethod='GET'
+    )
+
+def stream_to_s3(wav, sample_rate, filename, output_path, output_format="ogg"):
+    """Encode audio directly into S3
+
+    OGG is streamed through S3MultipartWriter; WAV/FLAC are encoded into a pooled
+    buffer and sent with one PutObject. If `output_path` is given, the encoded bytes are also written there on the volume.
+
+    Returns:
+        str: Presigned URL, or None if S3 is not configured or the upload failed
+    """
     if not config.S3_BUCKET_NAME:
         log.warning("S3_BUCKET_NAME not set, returning base64 audio")
         return None
 
+    sf_format, subtype, content_type, streamable = _AUDIO_FORMATS[output_format]
+
     try:
-        s3 = boto3.client(
-            's3',
-            endpoint_url=config.S3_ENDPOINT_URL,
-            aws_access_key_id=config.S3_ACCESS_KEY_ID,
-            aws_secret_access_key=config.S3_SECRET_ACCESS_KEY,
-            region_name=config.S3_REGION
-        )
-        
-        s3.upload_fileobj(
-            audio_buffer,
-            config.S3_BUCKET_NAME,
-            filename,
-            ExtraArgs={'ContentType': 'audio/ogg'}
-        )
-        
-        # Generate presigned URL
-        url = s3.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': config.S3_BUCKET_NAME, 'Key': filename},
-            ExpiresIn=3600  # 1 hour
-        )
+        s3 = _get_s3_client()
+
+        url = build_audio_url(s3, filename, content_type)
+
+        if not streamable:
+            # Already fully encoded in memory, so upload it in one PutObject without re-buffering
+            audio_buffer = _acquire_audio_buffer()
+            try:
+                sf.write(audio_buffer, wav, sample_rate, format=sf_format, subtype=subtype)
+                if output_path:
+                    with open(output_path, "wb") as local_file:
+                        local_file.write(audio_buffer.getbuffer())
+                audio_buffer.seek(0)
+                s3.put_object(Bucket=config.S3_BUCKET_NAME, Key=filename, Body=audio_buffer, ContentType=content_type)
+            finally:
+                _release_audio_buffer(audio_buffer)
+            return url
+
+        channels = wav.shape[1] if wav.ndim > 1 else 1
+        local_file = open(output_path, "wb") if output_path else None
+        try:
+            writer = S3MultipartWriter(s3, config.S3_BUCKET_NAME, filename, content_type, tee=local_file)
+            try:
+                with sf.SoundFile(writer, mode='w', samplerate=sample_rate, channels=channels,
+                                  format=sf_format, subtype=subtype) as f:
+                    f.write(wav)
+                writer.complete()
+            except Exception:
+                writer.abort()
+                raise
+        finally:
+            if local_file is not None:
+                local_file.close()
         return url
     except Exception as e:
-        log.error(f"S3 upload failed: {e}")
+        log.error("S3 upload failed: %s", e)
         return None
 
 def handler(job):
@@ -95,7 +473,8 @@ def handler(job):
         "audio_prompt": str (optional) - Path to audio reference file for voice cloning
                                         (relative to /runpod-volume/chatterbox/audio_prompts/)
         "stream": bool (optional) - Enable streaming mode (default: false)
-        "output_format": str (optional) - Output format for streaming: 'pcm_16' (default for CF workers)
+        "output_format": str (optional) - Streaming: 'pcm_16' (default for CF workers)
+                                         Batch: 'ogg' (default), 'wav' or 'flac'
         "exaggeration": float (optional) - Emotion/expressiveness level (0.0-1.0, default: 0.0, ignored by Turbo)
         "cfg_weight": float (optional) - Classifier-free guidance weight (0.0-1.0, default: 0.0, ignored by Turbo)
         "temperature": float (optional) - Sampling temperature (0.05-2.0, default: 0.8)
@@ -113,6 +492,7 @@ def handler(job):
         "status": "success",
         "sample_rate": int,
         "duration_sec": float,
+        "format": str,
         "audio_url": str (if S3 configured) OR "audio_base64": str (fallback)
     }
 
@@ -132,182 +512,166 @@ def handler(job):
     }
     """
     job_input = job.get("input", {})
+    _cancel_idle_release()
 
-    # Extract streaming parameters first
-    stream = job_input.get("stream", False)
-    output_format = job_input.get("output_format", "pcm_16")
+    try:
+        # Extract streaming parameters first
+        stream = job_input.get("stream", False)
+        output_format = job_input.get("output_format", "pcm_16")
+
+        # For streaming mode, use generator
+        if stream:
+            log.info("[Handler] Streaming mode requested: format=%s", output_format)
+            yield from handler_stream(job_input, output_format)
+            return
 
-    # For streaming mode, use generator
-    if stream:
-        log.info(f"[Handler] Streaming mode requested: format={output_format}")
-        yield from handler_stream(job_input, output_format)
-        return
+        # For batch mode, use original logic (yield result for consistency)
+        yield handler_batch(job)
+    finally:
+        _schedule_idle_release()
 
-    # For batch mode, use original logic (yield result for consistency)
-    yield handler_batch(job)
 
+class TTSParams(msgspec.Struct, gc=False):
+    """Validated generation parameters for a job (unknown input keys are ignored)"""
+    text: Annotated[str, msgspec.Meta(min_length=1, max_length=config.MAX_TEXT_LENGTH)]
+    audio_prompt: Optional[str] = None
+    # Used in object keys and file names, so restricted to URL- and path-safe characters
+    session_id: Union[Annotated[str, msgspec.Meta(pattern=r"^[A-Za-z0-9_-]{1,128}$")], int] = msgspec.field(default_factory=lambda: str(uuid.uuid4()))
 
-def _extract_and_validate_params(job_input: dict) -> tuple:
+    # ChatterBox Turbo generation parameters
+    exaggeration: Annotated[float, msgspec.Meta(ge=config.MIN_EXAGGERATION, le=config.MAX_EXAGGERATION)] = config.DEFAULT_EXAGGERATION
+    cfg_weight: Annotated[float, msgspec.Meta(ge=config.MIN_CFG_WEIGHT, le=config.MAX_CFG_WEIGHT)] = config.DEFAULT_CFG_WEIGHT
+    temperature: Annotated[float, msgspec.Meta(ge=config.MIN_TEMPERATURE, le=config.MAX_TEMPERATURE)] = config.DEFAULT_TEMPERATURE
+    repetition_penalty: float = config.DEFAULT_REPETITION_PENALTY
+    min_p: float = config.DEFAULT_MIN_P
+    top_p: Annotated[float, msgspec.Meta(ge=config.MIN_TOP_P, le=config.MAX_TOP_P)] = config.DEFAULT_TOP_P
+    top_k: Annotated[float, msgspec.Meta(ge=config.MIN_TOP_K, le=config.MAX_TOP_K)] = config.DEFAULT_TOP_K
+    norm_loudness: bool = config.DEFAULT_NORM_LOUDNESS
+
+    def __post_init__(self):
+        # Same coercions as before msgspec: fractional top_k is truncated, numeric session ids allowed
+        self.top_k = int(self.top_k)
+        self.session_id = str(self.session_id)
+
+
+class BatchTTSParams(TTSParams):
+    """TTSParams plus the container format for batch responses"""
+    output_format: str = "ogg"
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Case-insensitive; anything else (e.g. the streaming default 'pcm_16') gets OGG
+        self.output_format = self.output_format.lower()
+        if self.output_format not in _AUDIO_FORMATS:
+            self.output_format = "ogg"
+
+
+def _extract_and_validate_params(job_input: dict, schema=TTSParams) -> tuple:
     """Extract and validate parameters from job input.
 
+    Parsing, type coercion and range checks all happen in a single
+    msgspec.convert call against the given schema (TTSParams by default).
+
     Returns:
-        tuple: (params_dict, error_dict) - error_dict is None if validation passes
+        tuple: (params, error_dict) - error_dict is None if validation passes
     """
-    # Extract parameters
-    text = job_input.get("text")
-    if not text:
-        return None, {"error": "Missing 'text' parameter"}
-
-    audio_prompt = job_input.get("audio_prompt")
-    session_id = job_input.get("session_id", str(uuid.uuid4()))
-
-    # ChatterBox Turbo generation parameters
-    exaggeration = float(job_input.get("exaggeration", config.DEFAULT_EXAGGERATION))
-    cfg_weight = float(job_input.get("cfg_weight", config.DEFAULT_CFG_WEIGHT))
-    temperature = float(job_input.get("temperature", config.DEFAULT_TEMPERATURE))
-    repetition_penalty = float(job_input.get("repetition_penalty", config.DEFAULT_REPETITION_PENALTY))
-    min_p = float(job_input.get("min_p", config.DEFAULT_MIN_P))
-    top_p = float(job_input.get("top_p", config.DEFAULT_TOP_P))
-    top_k = int(job_input.get("top_k", config.DEFAULT_TOP_K))
-    norm_loudness = job_input.get("norm_loudness", config.DEFAULT_NORM_LOUDNESS)
-
-    # Validate input
-    if len(text) > config.MAX_TEXT_LENGTH:
-        return None, {"error": f"Text length exceeds maximum of {config.MAX_TEXT_LENGTH}"}
-
-    # Validate generation parameters
-    if not (config.MIN_EXAGGERATION <= exaggeration <= config.MAX_EXAGGERATION):
-        return None, {"error": f"exaggeration must be between {config.MIN_EXAGGERATION} and {config.MAX_EXAGGERATION}"}
-
-    if not (config.MIN_CFG_WEIGHT <= cfg_weight <= config.MAX_CFG_WEIGHT):
-        return None, {"error": f"cfg_weight must be between {config.MIN_CFG_WEIGHT} and {config.MAX_CFG_WEIGHT}"}
-
-    if not (config.MIN_TEMPERATURE <= temperature <= config.MAX_TEMPERATURE):
-        return None, {"error": f"temperature must be between {config.MIN_TEMPERATURE} and {config.MAX_TEMPERATURE}"}
-
-    if not (config.MIN_TOP_P <= top_p <= config.MAX_TOP_P):
-        return None, {"error": f"top_p must be between {config.MIN_TOP_P} and {config.MAX_TOP_P}"}
-
-    if not (config.MIN_TOP_K <= top_k <= config.MAX_TOP_K):
-        return None, {"error": f"top_k must be between {config.MIN_TOP_K} and {config.MAX_TOP_K}"}
-
-    params = {
-        "text": text,
-        "audio_prompt": audio_prompt,
-        "session_id": session_id,
-        "exaggeration": exaggeration,
-        "cfg_weight": cfg_weight,
-        "temperature": temperature,
-        "repetition_penalty": repetition_penalty,
-        "min_p": min_p,
-        "top_p": top_p,
-        "top_k": top_k,
-        "norm_loudness": norm_loudness,
-    }
-
-    return params, None
+    try:
+        return msgspec.convert(job_input, schema, strict=False), None
+    except msgspec.ValidationError as e:
+        return None, {"error": f"Invalid input: {e}"}
 
 
 def handler_batch(job):
     """Batch mode handler - generates complete audio and returns URL/base64"""
-    # Clean up old output files (older than 2 days)
-    cleanup_old_files(config.OUTPUT_DIR, days=2)
+    # Clean up old output files (older than 2 days) off the request path
+    schedule_cleanup(config.OUTPUT_DIR, days=2)
 
     job_input = job.get("input", {})
 
     # Extract and validate parameters
-    params, error = _extract_and_validate_params(job_input)
+    params, error = _extract_and_validate_params(job_input, BatchTTSParams)
     if error:
         return error
 
-    text = params["text"]
-    audio_prompt = params["audio_prompt"]
-    session_id = params["session_id"]
-    exaggeration = params["exaggeration"]
-    cfg_weight = params["cfg_weight"]
-    temperature = params["temperature"]
-    repetition_penalty = params["repetition_penalty"]
-    min_p = params["min_p"]
-    top_p = params["top_p"]
-    top_k = params["top_k"]
-    norm_loudness = params["norm_loudness"]
-
     try:
         # Generate audio
         wav = inference_engine.generate(
-            text=text,
-            audio_prompt=audio_prompt,
-            exaggeration=exaggeration,
-            cfg_weight=cfg_weight,
-            temperature=temperature,
-            min_p=min_p,
-            top_p=top_p,
-            top_k=top_k,
-            repetition_penalty=repetition_penalty,
-            norm_loudness=norm_loudness
+            text=params.text,
+            audio_prompt=params.audio_prompt,
+            exaggeration=params.exaggeration,
+            cfg_weight=params.cfg_weight,
+            temperature=params.temperature,
+            min_p=params.min_p,
+            top_p=params.top_p,
+            top_k=params.top_k,
+            repetition_penalty=params.repetition_penalty,
+            norm_loudness=params.norm_loudness
         )
 
         # Get the model's sample rate (ChatterBox models have built-in sample rate)
         if inference_engine.model is None:
             inference_engine.load_model()
         sample_rate = inference_engine.model.sr
-        log.info(f"Using model sample rate: {sample_rate}")
-
-        # Convert to audio bytes (OGG Vorbis)
-        log.info("Converting audio tensor to numpy...")
-        audio_buffer = io.BytesIO()
-        # Ensure wav is cpu numpy
-        if hasattr(wav, 'cpu'):
-            wav = wav.cpu().numpy()
-        if hasattr(wav, 'numpy'):
-            wav = wav.numpy()
-
-        # ChatterBox likely returns (channels, samples) or just (samples)
-        # Soundfile expects (samples, channels) usually, or just samples for mono
-        if len(wav.shape) > 1 and wav.shape[0] < wav.shape[1]:
-             wav = wav.T
+        log.debug("Using model sample rate: %d", sample_rate)
 
-        log.info(f"Writing audio to buffer (shape: {wav.shape})...")
-        sf.write(audio_buffer, wav, sample_rate, format='OGG', subtype='VORBIS')
-        audio_buffer.seek(0)
+        # Convert to audio bytes (OGG Vorbis by default)
+        log.debug("Converting audio tensor to numpy...")
+        # Ensure wav is cpu numpy (contiguous, so soundfile doesn't copy it again)
+        if isinstance(wav, torch.Tensor):
+            wav = wav.detach().cpu().contiguous().numpy()
 
-        # Upload to S3 or return base64
-        filename = f"{session_id}_{uuid.uuid4()}.ogg"
-
-        # Local output path for persistence in volume
-        output_path = os.path.join(config.OUTPUT_DIR, filename)
-        # Ensure output directory exists (it should be created by bootstrap, but good for safety)
-        os.makedirs(config.OUTPUT_DIR, exist_ok=True)
-
-        log.info(f"Saving audio locally to {output_path}...")
-        with open(output_path, "wb") as f:
-            f.write(audio_buffer.getbuffer())
-
-        # Reset buffer for S3 upload
-        audio_buffer.seek(0)
-
-        log.info("Uploading to S3 (if configured)...")
-        s3_url = upload_to_s3(audio_buffer, filename)
+        # ChatterBox returns (1, samples); soundfile wants just samples for mono
+        if wav.ndim == 2:
+            wav = np.squeeze(wav, axis=0)
 
+        # The response skeleton depends only on the audio, so build it before uploading
+        # (soundfile layout is (samples[, channels]), so the sample count is shape[0])
         response = {
             "status": "success",
             "sample_rate": sample_rate,
-            "duration_sec": len(wav) / sample_rate
+            "duration_sec": wav.shape[0] / sample_rate,
+            "format": params.output_format
         }
 
+        filename = f"{params.session_id}_{_fast_id()}.{params.output_format}"
+
+        # Local output path for persistence in volume (skipped for S3 unless requested)
+        output_path = None
+        if config.PERSIST_LOCAL_COPY or not config.S3_BUCKET_NAME:
+            output_path = f"{config.OUTPUT_DIR}/{filename}"
+
+        # Encode straight into S3 (teeing to the volume) without staging the whole file
+        log.debug("Streaming audio to S3 (if configured, shape: %s)...", wav.shape)
+        s3_url = stream_to_s3(wav, sample_rate, filename, output_path, params.output_format)
+
         if s3_url:
             response["audio_url"] = s3_url
         else:
             # Fallback to base64
-            audio_buffer.seek(0)
-            b64_audio = base64.b64encode(audio_buffer.read()).decode("utf-8")
-            response["audio_base64"] = b64_audio
-
-        log.info("Handler completed successfully.")
+            log.debug("Writing audio to buffer (shape: %s)...", wav.shape)
+            audio_buffer = _acquire_audio_buffer()
+            try:
+                sf_format, subtype, _, _ = _AUDIO_FORMATS[params.output_format]
+                sf.write(audio_buffer, wav, sample_rate, format=sf_format, subtype=subtype)
+
+                # base64 responses are always persisted, including when an S3 upload failed
+                output_path = output_path or f"{config.OUTPUT_DIR}/{filename}"
+                log.debug("Saving audio locally to %s...", output_path)
+                with open(output_path, "wb") as f:
+                    f.write(audio_buffer.getbuffer())
+
+                # getbuffer() is a zero-copy view; base64 output is pure ASCII
+                b64_audio = base64.b64encode(audio_buffer.getbuffer()).decode("ascii")
+                response["audio_base64"] = b64_audio
+            finally:
+                _release_audio_buffer(audio_buffer)
+
+        log.info("ok sr=%d dur=%.2fs fmt=%s up=%s", sample_rate, response["duration_sec"],
+                 params.output_format, bool(s3_url))
         return response
 
     except Exception as e:
-        log.error(f"Inference failed: {e}")
+        log.error("Inference failed: %s", e)
         return {"error": str(e)}
 
 
@@ -319,41 +683,56 @@ def handler_stream(job_input: dict, output_format: str):
         yield error
         return
 
-    text = params["text"]
-    audio_prompt = params["audio_prompt"]
-    exaggeration = params["exaggeration"]
-    cfg_weight = params["cfg_weight"]
-    temperature = params["temperature"]
-    repetition_penalty = params["repetition_penalty"]
-    min_p = params["min_p"]
-    top_p = params["top_p"]
-    top_k = params["top_k"]
-    norm_loudness = params["norm_loudness"]
-
     try:
         # Route based on output format
         if output_format == 'pcm_16':
             # Stream decoded audio chunks (for Cloudflare Workers)
             log.info("[Handler] Streaming decoded audio (pcm_16)")
             yield from inference_engine.generate_audio_stream_decoded(
-                text=text,
-                repetition_penalty=repetition_penalty,
-                min_p=min_p,
-                top_p=top_p,
-                audio_prompt=audio_prompt,
-                exaggeration=exaggeration,
-                cfg_weight=cfg_weight,
-                temperature=temperature,
-                top_k=top_k,
-                norm_loudness=norm_loudness,
+                text=params.text,
+                repetition_penalty=params.repetition_penalty,
+                min_p=params.min_p,
+                top_p=params.top_p,
+                audio_prompt=params.audio_prompt,
+                exaggeration=params.exaggeration,
+                cfg_weight=params.cfg_weight,
+                temperature=params.temperature,
+                top_k=params.top_k,
+                norm_loudness=params.norm_loudness,
             )
         else:
             # Unknown format
             yield {"error": f"Unknown output_format: {output_format}"}
 
     except Exception as e:
-        log.error(f"Streaming inference failed: {e}")
+        log.error("Streaming inference failed: %s", e)
         yield {"error": str(e)}
 
+def _warmup():
+    """Pay one-time initialization costs before the worker accepts jobs
+
+    Builds the S3 client (botocore loads its service data lazily), loads the
+    model (which also runs warmup generations, see ChatterBoxInference._warmup)
+    and LinaCodec, and loads libvorbis with a throwaway encode.
+    """
+    start_time = time.time()
+    try:
+        if config.S3_BUCKET_NAME:
+            _get_s3_client()
+
+        inference_engine.load_model()
+
+        # Streaming defaults to pcm_16, which encodes through LinaCodec
+        if LINACODEC_AVAILABLE:
+            load_linacodec()
+
+        sf.write(io.BytesIO(), np.zeros(16, np.float32), inference_engine.model.sr, format='OGG', subtype='VORBIS')
+
+        log.info("Warmup completed in %.2fs", time.time() - start_time)
+    except Exception as e:
+        log.warning("Warmup failed, first request will pay initialization cost: %s", e)
+
 if __name__ == "__main__":
+    _install_orjson_serializer()
+    _warmup()
     runpod.serverless.start({"handler": handler})
@@ -1,20 +1,28 @@
 import sys
 import os
+import re
 import torch
 import numpy as np
 import logging
 import soundfile as sf
-from pathlib import Path
-from typing import Generator, Dict, Any, Tuple
+from typing import Generator, Dict, Any, Tuple, Sequence
 import tempfile
 import base64
+import functools
+import inspect
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Add ChatterBox to path (it's cloned at runtime in bootstrap.sh)
 sys.path.insert(0, '/runpod-volume/chatterbox/chatterbox')
 
 import config
 
+# Audio prompts root, resolved once (realpath stats every path component on the network volume)
+_PROMPTS_DIR = os.path.realpath(config.AUDIO_PROMPTS_DIR)
+
 # =============================================================================
 # LINACODEC IMPORTS (for streaming support)
 # =============================================================================
@@ -28,6 +36,45 @@ except ImportError:
     log = logging.getLogger(__name__)
     log.warning("LinaCodec not available. Streaming in pcm_16 format will fall back to raw audio.")
 
+# =============================================================================
+# CHATTERBOX IMPORTS
+# =============================================================================
+# Imported once at module load (librosa and the chatterbox model stack are slow to
+# import), so neither load_model nor the first request pays for it. Only the model
+# class is required; chatterbox is cloned unpinned, so the internal helpers used by
+# the patched/pipelined paths are imported separately and only gate those paths.
+try:
+    from chatterbox.tts_turbo import ChatterboxTurboTTS
+    CHATTERBOX_AVAILABLE = True
+    _CHATTERBOX_IMPORT_ERROR = None
+except ImportError as e:
+    CHATTERBOX_AVAILABLE = False
+    _CHATTERBOX_IMPORT_ERROR = e
+    log.warning(f"ChatterBox not available: {e}")
+
+# Used by the patched prepare_conditionals
+try:
+    from chatterbox.tts_turbo import Conditionals
+    from chatterbox.models.s3gen import S3GEN_SR
+    from chatterbox.models.s3tokenizer import S3_SR
+    from chatterbox.models.t3.modules.cond_enc import T3Cond
+    import pyloudnorm
+    import scipy.signal
+    import torchaudio
+    _PATCH_IMPORT_ERROR = None
+except ImportError as e:
+    _PATCH_IMPORT_ERROR = e
+
+# Used by the pipelined multi-chunk path (_synthesize); without them chunks go through model.generate
+try:
+    from chatterbox.tts_turbo import punc_norm
+    from chatterbox.models.s3gen.const import S3GEN_SIL
+    _PIPELINE_AVAILABLE = True
+except ImportError as e:
+    _PIPELINE_AVAILABLE = False
+    if CHATTERBOX_AVAILABLE:
+        log.warning(f"Pipelined multi-chunk generation unavailable, using model.generate per chunk: {e}")
+
 # =============================================================================
 # LINACODEC GLOBAL CACHE
 # =============================================================================
@@ -52,11 +99,8 @@ def load_linacodec():
 
     log.info("[ChatterBox] Loading LinaCodec model from network volume...")
 
-    # Ensure cache is on network volume (use chatterbox subdirectory)
-    os.environ['HF_HOME'] = config.HF_HOME
-    os.environ['HF_HUB_CACHE'] = config.HF_HUB_CACHE
-
     # LinaCodec auto-downloads from HuggingFace to cache
+    # (config.py already points HF_HOME/HF_HUB_CACHE at the network volume)
     _LINA_CODEC_MODEL = LinaCodec()
 
     log.info("[ChatterBox] LinaCodec loaded and cached to network volume!")
@@ -118,39 +162,158 @@ def encode_to_linacodec(audio: torch.Tensor) -> Tuple[np.ndarray, np.ndarray]:
         if os.path.exists(tmp_wav_path):
             os.unlink(tmp_wav_path)
 
+# Text chunking boundaries. Splits keep trailing punctuation on the left part and drop
+# the whitespace and dashes (segments are stripped afterwards)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])[ \n]')  # '. ', '! ', '? ', '.\n', '!\n', '?\n'
+_CLAUSE_SPLIT_RE = re.compile(r'(?<=[,;:]) | [-—] ')  # ', ', '; ', ': ', ' - ', ' — '
+
+# Watermarking (CPU) of one chunk overlaps synthesis (GPU) of the next
+_WATERMARK_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="watermark")
+
 # Monkeypatch flag
 _MONKEYPATCH_APPLIED = False
+_MONKEYPATCH_LOCK = threading.Lock()
+
+
+def _to_device(tensor: torch.Tensor, device) -> torch.Tensor:
+    """Copy a CPU tensor to device as float32, staging through pinned memory on CUDA
+
+    Pinned (page-locked) sources let the copy run asynchronously instead of blocking
+    the host; PyTorch's caching host allocator reuses the pinned blocks across calls.
+    """
+    tensor = tensor.to(dtype=torch.float32)
+    if str(device).startswith("cuda") and tensor.device.type == "cpu":
+        return tensor.pin_memory().to(device, non_blocking=True)
+    return tensor.to(device)
+
+
+# BS.1770 K-weighting stages as pyloudnorm.Meter builds them: (gain dB, Q, corner Hz, type)
+_K_WEIGHTING_STAGES = (
+    (4.0, 1 / np.sqrt(2), 1500.0, 'high_shelf'),
+    (0.0, 0.5, 38.0, 'high_pass'),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _k_weighting_sos(sr: int) -> np.ndarray:
+    """K-weighting filter for a sample rate as one second-order-section cascade"""
+    filters = [pyloudnorm.IIRfilter(G, Q, fc, sr, filter_type) for G, Q, fc, filter_type in _K_WEIGHTING_STAGES]
+    return np.array([np.concatenate([f.b * f.passband_gain, f.a]) for f in filters])
+
+
+def _norm_loudness(wav: np.ndarray, sr: int, target_lufs: float = -27) -> np.ndarray:
+    """Drop-in for ChatterboxTurboTTS.norm_loudness (pyloudnorm BS.1770-4 integrated loudness)
+
+    Same measurement, but the filter coefficients are built once per sample rate, both
+    filter stages run in a single sosfilt pass, and block gating is vectorized with a
+    cumulative sum instead of pyloudnorm's per-block Python loop.
+    """
+    block, step = 0.4 * sr, 0.1 * sr  # 400 ms gating blocks, 75% overlap
+    if len(wav) < block:
+        log.warning("Audio prompt too short for loudness measurement, skipping normalization")
+        return wav
+
+    filtered = scipy.signal.sosfilt(_k_weighting_sos(sr), wav.astype(np.float64, copy=False))
+    n_blocks = int(np.round((len(wav) - block) / step)) + 1
+    starts = (np.arange(n_blocks) * step).astype(np.int64)
+    energy = np.concatenate(([0.0], np.cumsum(np.square(filtered))))
+    z = (energy[np.minimum(starts + int(block), len(wav))] - energy[starts]) / block
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        block_lufs = -0.691 + 10.0 * np.log10(z)
+        gated = z[block_lufs >= -70.0]
+        gamma_r = -0.691 + 10.0 * np.log10(np.mean(gated)) - 10.0 if gated.size else -np.inf
+        gated = z[(block_lufs > gamma_r) & (block_lufs > -70.0)]
+        loudness = -0.691 + 10.0 * np.log10(np.mean(gated) if gated.size else 0.0)
+
+    # Python float gain keeps a float32 prompt float32 (a NumPy float64 scalar would promote it)
+    gain_linear = float(10.0 ** ((target_lufs - loudness) / 20.0))
+    if np.isfinite(gain_linear) and gain_linear > 0.0:
+        wav = wav * gain_linear
+    return wav
+
+
+# Voice prompt resampling: Kaiser-windowed sinc with torchaudio's "kaiser_best" settings,
+# closer to upstream's librosa (soxr_hq) output than the default Hann window
+_RESAMPLE_KWARGS = dict(
+    resampling_method="sinc_interp_kaiser",
+    lowpass_filter_width=64,
+    rolloff=0.9475937167399596,
+    beta=14.769656459379492,
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _resampler(orig_sr: int, new_sr: int, device: str):
+    """torchaudio Resample transform for a rate pair, built once per device
+
+    The transform precomputes its sinc kernel, which functional.resample would
+    rebuild on every call; 24k->16k is used by every prompt.
+    """
+    return torchaudio.transforms.Resample(orig_sr, new_sr, **_RESAMPLE_KWARGS).to(device)
+
 
 def apply_monkeypatches():
     """Apply monkeypatches to fix Float64/Float32 type mismatches"""
-    global _MONKEYPATCH_APPLIED
-
     if _MONKEYPATCH_APPLIED:
         log.debug("Monkeypatches already applied, skipping")
         return
 
+    # Serialize patching so concurrent callers can't both wrap the class
+    with _MONKEYPATCH_LOCK:
+        if not _MONKEYPATCH_APPLIED:
+            _apply_monkeypatches()
+
+
+def _apply_monkeypatches():
+    global _MONKEYPATCH_APPLIED
+
+    if not CHATTERBOX_AVAILABLE or _PATCH_IMPORT_ERROR is not None:
+        log.warning(f"Could not apply monkeypatch (ChatterBox not yet available): {_CHATTERBOX_IMPORT_ERROR or _PATCH_IMPORT_ERROR}")
+        return
+
     try:
-        from chatterbox.tts_turbo import ChatterboxTurboTTS, Conditionals
-        from chatterbox.models.s3gen import S3GEN_SR
-        from chatterbox.models.s3tokenizer import S3_SR
-        from chatterbox.models.t3.modules.cond_enc import T3Cond
-        import librosa
+        # The patched class outlives this module if it is ever re-imported, so the
+        # marker on the method (not the module flag) is the source of truth
+        if getattr(ChatterboxTurboTTS.prepare_conditionals, "_patched", False):
+            _MONKEYPATCH_APPLIED = True
+            log.debug("ChatterboxTurboTTS.prepare_conditionals already patched, skipping")
+            return
 
         # Monkeypatch prepare_conditionals to fix Float64/Float32 mismatch
-        original_prepare_conditionals = ChatterboxTurboTTS.prepare_conditionals
-
         def patched_prepare_conditionals(self, wav_fpath, exaggeration=0.0, norm_loudness=True):
-            ## Load and norm reference wav
-            s3gen_ref_wav, _sr = librosa.load(wav_fpath, sr=S3GEN_SR, dtype='float32')
+            ## Load and norm reference wav (downmix to mono, resample on the model device)
+            # Only decode as much as can be used: the conditioning windows, or the
+            # recommended maximum prompt length (the voice encoder embeds the whole prompt)
+            max_sec = max(config.MAX_AUDIO_DURATION, self.DEC_COND_LEN / S3GEN_SR, self.ENC_COND_LEN / S3_SR)
+            try:
+                with sf.SoundFile(wav_fpath) as f:
+                    ref_sr = f.samplerate
+                    ref_wav = f.read(frames=int(max_sec * ref_sr), dtype='float32', always_2d=True)
+                ref_wav = torch.from_numpy(ref_wav.mean(axis=1))
+            except RuntimeError:
+                # Containers libsndfile can't decode (m4a, aac, webm) go through torchaudio,
+                # which also stops decoding after num_frames
+                ref_sr = torchaudio.info(wav_fpath).sample_rate
+                ref_wav, ref_sr = torchaudio.load(wav_fpath, num_frames=int(max_sec * ref_sr))
+                ref_wav = ref_wav.mean(dim=0)
+            ref_wav = _to_device(ref_wav, self.device)
+            if ref_sr != S3GEN_SR:
+                ref_wav = _resampler(ref_sr, S3GEN_SR, self.device)(ref_wav)
+            s3gen_ref_wav, _sr = ref_wav.cpu().numpy(), S3GEN_SR
 
             # Assert removed or handled gracefully
             if len(s3gen_ref_wav) / _sr <= 3.0:
                  log.warning("Audio prompt is shorter than recommended 3 seconds.")
 
             if norm_loudness:
-                s3gen_ref_wav = self.norm_loudness(s3gen_ref_wav, _sr)
+                s3gen_ref_wav = _norm_loudness(s3gen_ref_wav, _sr)
 
-            ref_16k_wav = librosa.resample(s3gen_ref_wav, orig_sr=S3GEN_SR, target_sr=S3_SR).astype('float32')
+            # 16 kHz copy stays on device for the S3 tokenizer; the voice encoder's mel needs numpy
+            ref_16k_t = _resampler(S3GEN_SR, S3_SR, self.device)(
+                _to_device(torch.from_numpy(s3gen_ref_wav.astype('float32', copy=False)), self.device)
+            )
+            ref_16k_wav = ref_16k_t.cpu().numpy()
 
             s3gen_ref_wav = s3gen_ref_wav[:self.DEC_COND_LEN]
             s3gen_ref_dict = self.s3gen.embed_ref(s3gen_ref_wav, S3GEN_SR, device=self.device)
@@ -159,13 +322,14 @@ def apply_monkeypatches():
             t3_cond_prompt_tokens = None
             if hasattr(self.t3.hp, 'speech_cond_prompt_len') and (plen := self.t3.hp.speech_cond_prompt_len):
                 s3_tokzr = self.s3gen.tokenizer
-                t3_cond_prompt_tokens, _ = s3_tokzr.forward([ref_16k_wav[:self.ENC_COND_LEN]], max_len=plen)
-                t3_cond_prompt_tokens = torch.atleast_2d(t3_cond_prompt_tokens).to(self.device)
+                t3_cond_prompt_tokens, _ = s3_tokzr.forward([ref_16k_t[:self.ENC_COND_LEN]], max_len=plen)
+                if t3_cond_prompt_tokens.dim() == 1:
+                    t3_cond_prompt_tokens = t3_cond_prompt_tokens.unsqueeze(0)
 
             # Voice-encoder speaker embedding
             # FIX: Explicitly cast to float32 to ensure float32 instead of double
-            ve_embed = torch.from_numpy(self.ve.embeds_from_wavs([ref_16k_wav], sample_rate=S3_SR)).to(dtype=torch.float32)
-            ve_embed = ve_embed.mean(axis=0, keepdim=True).to(self.device)
+            ve_embed = torch.from_numpy(self.ve.embeds_from_wavs([ref_16k_wav], sample_rate=S3_SR))
+            ve_embed = _to_device(ve_embed, self.device).mean(dim=0, keepdim=True)
 
             # FIX: Create emotion_adv tensor with explicit float32 dtype on CPU, then move to device
             # Creating directly on device before .to() can cause tensor corruption
@@ -179,22 +343,76 @@ def apply_monkeypatches():
             self.conds = Conditionals(t3_cond, s3gen_ref_dict)
 
         # Apply the patch
+        patched_prepare_conditionals._patched = True
         ChatterboxTurboTTS.prepare_conditionals = patched_prepare_conditionals
         _MONKEYPATCH_APPLIED = True
         log.info("✓ Monkeypatched ChatterboxTurboTTS.prepare_conditionals to fix Float32/Float64 type mismatches")
 
-    except ImportError as e:
-        log.warning(f"Could not apply monkeypatch (ChatterBox not yet available): {e}")
     except Exception as e:
         log.error(f"Error applying monkeypatch: {e}", exc_info=True)
 
+def _static_to_dynamic_cache(static_cache, length, dynamic_cache):
+    """Copy the first `length` positions of every StaticCache layer into dynamic_cache"""
+    layers = getattr(static_cache, "layers", None)
+    if layers is not None:
+        kv = [(layer.keys, layer.values) for layer in layers]
+    else:
+        kv = zip(static_cache.key_cache, static_cache.value_cache)  # transformers < 4.56
+    for layer_idx, (keys, values) in enumerate(kv):
+        dynamic_cache.update(keys[:, :, :length], values[:, :, :length], layer_idx)
+    return dynamic_cache
+
+@functools.lru_cache(maxsize=256)
+def _validate_audio_prompt(full_path: str, mtime_ns: int, size: int) -> str:
+    """Validate an audio prompt and return its resolved path
+
+    Cached on (path, mtime, size), so a file is only re-validated (realpath,
+    header probe) after it changes on the volume. Invalid prompts raise
+    ValueError, which lru_cache does not cache.
+    """
+    # Security check: ensure path is within AUDIO_PROMPTS_DIR (after resolving symlinks and '..')
+    resolved_path = os.path.realpath(full_path)
+    if not resolved_path.startswith(_PROMPTS_DIR + os.sep):
+        raise ValueError("Invalid audio_prompt path: Path traversal detected")
+
+    suffix = os.path.splitext(resolved_path)[1]
+    if suffix.lower() not in config.AUDIO_EXTS:
+        raise ValueError(f"Unsupported audio format: {suffix}")
+
+    # Validate audio duration (header only)
+    try:
+        duration = sf.info(resolved_path).duration
+
+        if duration < config.MIN_AUDIO_DURATION:
+            log.warning(f"Audio duration {duration:.2f}s is below recommended minimum of {config.MIN_AUDIO_DURATION}s")
+        elif duration > config.MAX_AUDIO_DURATION:
+            log.warning(f"Audio duration {duration:.2f}s exceeds recommended maximum of {config.MAX_AUDIO_DURATION}s")
+        else:
+            log.info(f"Audio prompt duration: {duration:.2f}s (within recommended range)")
+    except Exception as e:
+        log.warning(f"Could not validate audio duration: {e}")
+
+    return resolved_path
+
 class ChatterBoxInference:
     def __init__(self):
         self.model = None
+        # Allocator settings are only read at CUDA init, so set them before touching CUDA
+        if not torch.cuda.is_initialized():
+            os.environ["PYTORCH_CUDA_ALLOC_CONF"] = config.PYTORCH_CUDA_ALLOC_CONF
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.autocast_dtype = None  # Resolved in load_model (querying bf16 support initializes CUDA)
+        self._default_conds = None  # Built-in voice conditionals from from_pretrained
+        self._eager_tfmr = None  # Original T3 transformer, kept while a compiled wrapper is installed
+        self._eager_estimator = None  # Original S3Gen flow estimator, likewise
+        self._kv_cache = None  # Preallocated T3 KV cache, reused by every generate() call
+        self._t3_weights_cast = False  # T3 transformer weights stored in autocast_dtype
+        self._vocoder_stream = None  # CUDA stream for S3Gen, so it overlaps the next chunk's T3 decode
+        self._pipeline_enabled = _PIPELINE_AVAILABLE  # Multi-chunk requests use _synthesize + _WATERMARK_POOL
+        self._cond_cache = OrderedDict()  # (prompt version, exaggeration, norm_loudness) -> (created_at, Conditionals)
         self.max_chunk_chars = config.MAX_CHUNK_CHARS  # Maximum characters per chunk for stable generation
 
-    def _smart_chunk_text(self, text: str, max_chars: int = None) -> list[str]:
+    def _smart_chunk_text(self, text: str, max_chars: int = None) -> Sequence[str]:
         """Split text into chunks at natural boundaries (sentences, clauses)
 
         Args:
@@ -202,52 +420,37 @@ class ChatterBoxInference:
             max_chars: Maximum characters per chunk (default: self.max_chunk_chars)
 
         Returns:
-            List of text chunks
+            Sequence of text chunks (a 1-tuple when no split is needed)
         """
         if max_chars is None:
             max_chars = self.max_chunk_chars
 
-        # If text is short enough, return as-is
+        # If text is short enough, return as-is (the common case)
         if len(text) <= max_chars:
-            return [text]
+            return (text,)
 
         chunks = []
-
-        # Primary split on sentence endings
-        sentence_endings = ['. ', '! ', '? ', '.\n', '!\n', '?\n']
-        # Secondary split on clause boundaries
-        clause_boundaries = [', ', '; ', ': ', ' - ', ' — ']
-
-        def split_at_boundaries(text_segment: str, boundaries: list[str]) -> list[str]:
-            """Split text at specified boundaries"""
-            parts = []
-            current = ""
-
-            i = 0
-            while i < len(text_segment):
-                current += text_segment[i]
-
-                # Check if we're at a boundary
-                for boundary in boundaries:
-                    if text_segment[i:i+len(boundary)] == boundary:
-                        if len(current) > 0:
-                            parts.append(current)
-                            current = ""
-                        i += len(boundary) - 1
-                        break
-                i += 1
-
-            if current:
-                parts.append(current)
-
-            return parts
+        parts = []  # Pieces of the chunk being packed, joined with spaces once on emission
+        parts_len = 0  # len(" ".join(parts))
+
+        def emit():
+            nonlocal parts, parts_len
+            if parts:
+                chunks.append(" ".join(parts))
+                parts, parts_len = [], 0
+
+        def pack(piece: str):
+            """Add piece to the current chunk, starting a new chunk if it doesn't fit"""
+            nonlocal parts_len
+            if parts_len + len(piece) + 1 > max_chars:
+                emit()
+            parts_len += len(piece) + 1 if parts else len(piece)
+            parts.append(piece)
 
         # First try splitting on sentences
-        segments = split_at_boundaries(text, sentence_endings)
+        segments = _SENTENCE_SPLIT_RE.split(text)
 
         # Combine segments into chunks respecting max_chars
-        current_chunk = ""
-
         for segment in segments:
             segment = segment.strip()
             if not segment:
@@ -255,59 +458,31 @@ class ChatterBoxInference:
 
             # If single segment is too long, split on clause boundaries
             if len(segment) > max_chars:
-                # First save current chunk if exists
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
+                emit()
 
-                # Split long segment on clauses
-                clauses = split_at_boundaries(segment, clause_boundaries)
-
-                for clause in clauses:
+                for clause in _CLAUSE_SPLIT_RE.split(segment):
                     clause = clause.strip()
                     if not clause:
                         continue
 
                     # If single clause is still too long, hard split by words
                     if len(clause) > max_chars:
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                            current_chunk = ""
-
-                        words = clause.split()
-                        for word in words:
-                            if len(current_chunk) + len(word) + 1 <= max_chars:
-                                current_chunk += " " + word if current_chunk else word
-                            else:
-                                if current_chunk:
-                                    chunks.append(current_chunk.strip())
-                                current_chunk = word
+                        emit()
+                        for word in clause.split():
+                            pack(word)
                     else:
-                        # Clause fits, check if we can add to current chunk
-                        if len(current_chunk) + len(clause) + 1 <= max_chars:
-                            current_chunk += " " + clause if current_chunk else clause
-                        else:
-                            if current_chunk:
-                                chunks.append(current_chunk.strip())
-                            current_chunk = clause
+                        pack(clause)
             else:
-                # Segment fits in max_chars, try to add to current chunk
-                if len(current_chunk) + len(segment) + 1 <= max_chars:
-                    current_chunk += " " + segment if current_chunk else segment
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                    current_chunk = segment
+                pack(segment)
 
         # Add final chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        emit()
 
         # Filter empty chunks
         chunks = [c for c in chunks if c.strip()]
 
         if not chunks:
-            return [text]  # Fallback to original text
+            return (text,)  # Fallback to original text
 
         log.info(f"Split text into {len(chunks)} chunks (max {max_chars} chars each)")
         return chunks
@@ -319,80 +494,421 @@ class ChatterBoxInference:
 
         log.info(f"Loading ChatterBox Turbo model on {self.device}...")
         try:
+            if not CHATTERBOX_AVAILABLE:
+                raise RuntimeError(f"ChatterBox is not installed: {_CHATTERBOX_IMPORT_ERROR}")
+
             # Apply monkeypatches before loading model
             apply_monkeypatches()
 
-            # Import here to avoid build-time errors
-            from chatterbox.tts_turbo import ChatterboxTurboTTS
-
             self.model = ChatterboxTurboTTS.from_pretrained(device=self.device)
             log.info(f"Model loaded successfully (sample rate: {self.model.sr})")
-            return self.model
+            self._default_conds = self.model.conds
         except Exception as e:
             log.error(f"Failed to load model: {e}")
             raise
 
-    def process_audio_prompt(self, audio_prompt_path: str) -> str:
-        """Process and validate audio reference for voice cloning"""
-        if not audio_prompt_path:
-            return None
+        if self.device == "cuda":
+            # Let remaining FP32 matmuls (e.g. ops autocast keeps in FP32) use TF32 tensor cores
+            torch.backends.cuda.matmul.allow_tf32 = True
+            self.autocast_dtype = self._resolve_autocast_dtype()
+            log.info(f"Autocast dtype: {self.autocast_dtype or 'disabled (float32)'}")
+
+            if self.autocast_dtype is not None and config.T3_HALF_WEIGHTS:
+                # Autocast re-casts FP32 weights on every call (its cast cache is dropped when
+                # each autocast region exits); storing the T3 transformer's weights in the
+                # autocast dtype skips that per-token work. S3Gen keeps FP32 weights.
+                self.model.t3.tfmr.to(dtype=self.autocast_dtype)
+                try:
+                    self._t3_smoke_test()
+                    self._t3_weights_cast = True
+                    log.info(f"T3 transformer weights cast to {self.autocast_dtype}")
+                except Exception as e:
+                    log.warning(f"T3 failed its smoke test with {self.autocast_dtype} weights, keeping FP32: {e}")
+                    self.model.t3.tfmr.float()
+
+            self._vocoder_stream = torch.cuda.Stream()
+
+            if config.T3_KV_CACHE_LEN > 0:
+                self._install_static_kv_cache()
+            if config.TORCH_COMPILE:
+                self._compile_model()
+
+            # Weight uploads are asynchronous; finish them (and CUDA context setup) before warmup
+            torch.cuda.synchronize()
+
+        self._warmup()
+        return self.model
+
+    def _install_static_kv_cache(self):
+        """Route T3's decode loop through one preallocated KV cache
+
+        inference_turbo starts every generation with a fresh DynamicCache that grows
+        by torch.cat each token. Here the prefill call (use_cache with no cache passed)
+        gets a StaticCache instead: its buffers are allocated once and only zeroed per
+        request. Prompts that wouldn't fit alongside a full-length generation keep the
+        dynamic cache, and a generation that would still overrun the static cache is
+        moved to a dynamic one. A one-token smoke test validates the hook; on failure
+        T3 keeps the dynamic cache.
+        """
+        tfmr = getattr(self.model.t3, "tfmr", None)
+        if tfmr is None:
+            log.warning("T3 has no 'tfmr' module, skipping static KV cache")
+            return
+
+        # Decode steps per generation, read from the same default inference_turbo uses
+        try:
+            max_gen_len = int(inspect.signature(self.model.t3.inference_turbo).parameters["max_gen_len"].default)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            log.warning(f"Could not read inference_turbo's max_gen_len, using dynamic KV cache: {e}")
+            return
 
-        # Validate file path (security)
-        full_path = Path(config.AUDIO_PROMPTS_DIR) / audio_prompt_path
+        max_cache_len = config.T3_KV_CACHE_LEN
+        # Prefill + first sampled token + max_gen_len decode steps must fit
+        max_prefill = max_cache_len - 1 - max_gen_len
 
-        # Security check: ensure path is within AUDIO_PROMPTS_DIR
         try:
-            full_path = full_path.resolve()
-            prompts_dir = Path(config.AUDIO_PROMPTS_DIR).resolve()
-            # If directory doesn't exist yet (e.g. unit testing locally without volume), create it or mock it
-            # But in production it exists.
-            if not prompts_dir.exists():
-                # fallback for safety checks if dir doesn't exist
-                pass
-            elif not str(full_path).startswith(str(prompts_dir)):
-                # Double check with simple string manipulation if resolve logic is tricky with symlinks
-                # But resolve() is generally safer.
-                raise ValueError("Invalid audio_prompt path: Path traversal detected")
+            from transformers import DynamicCache, StaticCache
+            if "device" in inspect.signature(StaticCache.__init__).parameters:
+                # Older transformers allocate the buffers up front and need their shape and placement
+                self._kv_cache = StaticCache(
+                    config=tfmr.config, max_batch_size=1, max_cache_len=max_cache_len,
+                    device=self.device, dtype=self.autocast_dtype or torch.float32,
+                )
+            else:
+                self._kv_cache = StaticCache(config=tfmr.config, max_cache_len=max_cache_len)
         except Exception as e:
-            # If resolution fails (e.g. file doesn't exist yet), check simple string prefix
-            if not str(full_path).startswith(str(config.AUDIO_PROMPTS_DIR)):
-                raise ValueError("Invalid audio_prompt path")
+            log.warning(f"Static KV cache unavailable, using dynamic cache: {e}")
+            return
 
-        # Check file exists and extension
-        if not full_path.exists():
-            raise ValueError(f"Audio prompt not found: {audio_prompt_path}")
+        eager_forward = tfmr.forward
+        filled = 0  # Tokens written to the static cache, tracked on the host (no device sync)
+
+        def forward(*args, past_key_values=None, use_cache=None, inputs_embeds=None, **kwargs):
+            nonlocal filled
+            if use_cache and inputs_embeds is not None and self._kv_cache is not None:
+                n = inputs_embeds.shape[1]
+                if past_key_values is None and n <= max_prefill:
+                    self._kv_cache.reset()
+                    past_key_values = self._kv_cache
+                    filled = 0
+                if past_key_values is self._kv_cache:
+                    if filled + n > max_cache_len:
+                        log.warning(f"T3 generation exceeded the static KV cache ({max_cache_len}), continuing with a dynamic cache")
+                        past_key_values = _static_to_dynamic_cache(self._kv_cache, filled, DynamicCache())
+                    else:
+                        # Positions from the host-side count; otherwise they are derived from
+                        # StaticCache.get_seq_length(), a device reduction that syncs every token
+                        kwargs.setdefault("cache_position", torch.arange(filled, filled + n, device=inputs_embeds.device))
+                    filled += n
+            return eager_forward(*args, past_key_values=past_key_values, use_cache=use_cache,
+                                 inputs_embeds=inputs_embeds, **kwargs)
+
+        tfmr.forward = forward
+        try:
+            self._t3_smoke_test()
+        except Exception as e:
+            log.warning(f"Static KV cache failed its smoke test, using dynamic cache: {e}")
+            tfmr.forward = eager_forward
+            self._kv_cache = None
+            return
+        log.info(f"T3 static KV cache enabled (max_cache_len={max_cache_len}, max prefill {max_prefill} tokens)")
+
+    def _t3_smoke_test(self):
+        """Run one prefill and one decode step through the T3 transformer (raises on failure)"""
+        tfmr = self.model.t3.tfmr
+        embeds = torch.zeros(1, 2, tfmr.config.hidden_size, device=self.device)
+        with torch.inference_mode(), self._autocast():
+            out = tfmr(inputs_embeds=embeds, use_cache=True)
+            tfmr(inputs_embeds=embeds[:, :1], past_key_values=out.past_key_values, use_cache=True)
+        if self.device == "cuda":
+            torch.cuda.synchronize()
+
+    def _compile_model(self):
+        """Wrap the T3 decoder transformer (run once per generated token) and the S3Gen
+        flow estimator with torch.compile
+
+        T3's own inference methods drive the decode loop, and torch.compile only
+        compiles forward(), so the per-token backbone is the module worth compiling.
+        Compilation happens lazily on the first call; _warmup reverts to eager if it fails.
+        """
+        tfmr = getattr(self.model.t3, "tfmr", None)
+        if tfmr is None:
+            log.warning("T3 has no 'tfmr' module, skipping torch.compile")
+            return
 
-        if full_path.suffix.lower() not in config.AUDIO_EXTS:
-            raise ValueError(f"Unsupported audio format: {full_path.suffix}")
+        try:
+            self.model.t3.tfmr = torch.compile(tfmr, mode=config.TORCH_COMPILE_MODE, fullgraph=False)
+            self._eager_tfmr = tfmr
+            log.info(f"T3 transformer wrapped with torch.compile (mode={config.TORCH_COMPILE_MODE})")
+        except Exception as e:
+            log.warning(f"torch.compile failed, running eager: {e}")
+
+        # S3Gen's flow-matching estimator runs n_cfm_timesteps times per chunk over a
+        # mel length that varies with every chunk, so it is compiled with dynamic shapes
+        # (and without CUDA graphs, which would be recorded per length)
+        cfm = getattr(getattr(self.model.s3gen, "flow", None), "decoder", None)
+        estimator = getattr(cfm, "estimator", None)
+        if estimator is None:
+            log.warning("S3Gen has no flow estimator, skipping torch.compile")
+            return
 
-        # Validate audio duration
         try:
-            audio_info = sf.info(str(full_path))
-            duration = audio_info.duration
+            cfm.estimator = torch.compile(estimator, dynamic=True, fullgraph=False)
+            self._eager_estimator = estimator
+            log.info("S3Gen flow estimator wrapped with torch.compile (dynamic shapes)")
+        except Exception as e:
+            log.warning(f"torch.compile of S3Gen estimator failed, running eager: {e}")
+
+    def _resolve_autocast_dtype(self):
+        """Map config.INFERENCE_DTYPE to an autocast dtype (None disables autocast)"""
+        dtype = config.INFERENCE_DTYPE
+        if dtype == "auto":
+            return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        if dtype == "bfloat16":
+            return torch.bfloat16
+        if dtype == "float16":
+            return torch.float16
+        if dtype != "float32":
+            log.warning(f"Unknown INFERENCE_DTYPE '{dtype}', running in float32")
+        return None
+
+    def _autocast(self):
+        """Autocast context for model calls (no-op on CPU or when running in float32)"""
+        return torch.autocast(
+            device_type="cuda",
+            dtype=self.autocast_dtype or torch.float16,
+            enabled=self.autocast_dtype is not None
+        )
+
+    def _warmup(self):
+        """Warm up the single-chunk path, then check the pipelined multi-chunk path"""
+        self._warmup_generations()
+        self._check_pipeline()
+
+    def _check_pipeline(self):
+        """Run one chunk through _synthesize and the watermark pool
+
+        The pipelined path re-implements the tail of upstream generate(), so it is
+        exercised once here; if it fails, multi-chunk requests go through
+        model.generate per chunk instead.
+        """
+        if not self._pipeline_enabled:
+            return
+        if self.model.conds is None:
+            log.info("Skipping pipeline check (no pre-prepared conditionals)")
+            return
 
-            if duration < config.MIN_AUDIO_DURATION:
-                log.warning(f"Audio duration {duration:.2f}s is below recommended minimum of {config.MIN_AUDIO_DURATION}s")
-            elif duration > config.MAX_AUDIO_DURATION:
-                log.warning(f"Audio duration {duration:.2f}s exceeds recommended maximum of {config.MAX_AUDIO_DURATION}s")
-            else:
-                log.info(f"Audio prompt duration: {duration:.2f}s (within recommended range)")
+        try:
+            with torch.inference_mode(), self._autocast():
+                wav, ready = self._synthesize(
+                    "Hello world.",
+                    temperature=config.DEFAULT_TEMPERATURE,
+                    top_p=config.DEFAULT_TOP_P,
+                    top_k=int(config.DEFAULT_TOP_K),
+                    repetition_penalty=config.DEFAULT_REPETITION_PENALTY,
+                )
+            _WATERMARK_POOL.submit(self._watermark, wav, ready).result()
+        except torch.cuda.OutOfMemoryError as e:
+            log.warning(f"Pipeline check ran out of GPU memory: {e}")
         except Exception as e:
-            log.warning(f"Could not validate audio duration: {e}")
+            log.warning(f"Pipelined multi-chunk generation failed its check, using model.generate per chunk: {e}")
+            self._pipeline_enabled = False
+
+    def _warmup_generations(self):
+        """Run a few short generations so the caching allocator holds the block
+        sizes the model needs and the first request doesn't pay for cudaMalloc
+
+        The half-precision T3 weights and the static KV cache are validated when
+        installed. If a warmup generation fails for another reason, torch.compile
+        and then autocast are turned off one at a time, retrying after each.
+        """
+        while True:
+            compiled = self._eager_tfmr is not None or self._eager_estimator is not None
+            # A compiled model needs at least one run to trace and record CUDA graphs
+            runs = max(config.MODEL_WARMUP_RUNS, 1 if compiled else 0)
+            if runs <= 0:
+                return
+
+            # Warmup needs conditionals; without a built-in voice there is nothing to run
+            if self.model.conds is None:
+                log.info("Skipping model warmup (no pre-prepared conditionals)")
+                return
+
+            start_time = time.time()
+            try:
+                with torch.inference_mode(), self._autocast():
+                    for _ in range(runs):
+                        self.model.generate("Hello world.")
+                if self.device == "cuda":
+                    torch.cuda.synchronize()
+                log.info(f"Model warmup completed in {time.time() - start_time:.2f}s")
+                return
+            except torch.cuda.OutOfMemoryError as e:
+                # Not caused by an optional feature, so there is nothing to revert
+                log.warning(f"Model warmup ran out of GPU memory: {e}")
+                return
+            except Exception as e:
+                log.warning(f"Model warmup failed: {e}")
+                if not (self._revert_compile() or self._disable_autocast()):
+                    return
+
+    def _revert_compile(self):
+        """Swap the torch.compile wrappers back for the eager modules (False if none)"""
+        if self._eager_tfmr is None and self._eager_estimator is None:
+            return False
+        if self._eager_tfmr is not None:
+            log.warning("Reverting T3 transformer to eager mode")
+            self.model.t3.tfmr = self._eager_tfmr
+            self._eager_tfmr = None
+        if self._eager_estimator is not None:
+            log.warning("Reverting S3Gen flow estimator to eager mode")
+            self.model.s3gen.flow.decoder.estimator = self._eager_estimator
+            self._eager_estimator = None
+        return True
+
+    def _disable_autocast(self):
+        """Fall back to float32 inference, with the features that depend on autocast (False if already off)"""
+        if self.autocast_dtype is None:
+            return False
+        log.warning(f"Disabling {self.autocast_dtype} autocast, running in float32")
+        self.autocast_dtype = None
+        if self._t3_weights_cast:
+            self.model.t3.tfmr.float()
+            self._t3_weights_cast = False
+        if self._kv_cache is not None:
+            # Its buffers were allocated for half-precision keys/values
+            log.warning("Falling back to the dynamic T3 KV cache")
+            self._kv_cache = None
+        return True
+
+    def _set_conditionals(self, audio_prompt_path, prompt_version, exaggeration, norm_loudness):
+        """Point self.model.conds at the conditionals for this request
+
+        Prepared conditionals are cached per prompt file version (the key from
+        _resolve_audio_prompt), so a repeat voice skips audio decoding, resampling,
+        the voice encoder and S3Gen embedding. Without an audio prompt the model's
+        built-in voice is restored, so a previous request's cloned voice doesn't
+        leak into this one.
+        """
+        if not audio_prompt_path:
+            if self._default_conds is not None:
+                self.model.conds = self._default_conds
+            return
+
+        key = (prompt_version, round(float(exaggeration), 4), bool(norm_loudness))
+        now = time.time()
+
+        cached = self._cond_cache.get(key)
+        if cached is not None and now - cached[0] < config.COND_CACHE_TTL:
+            self._cond_cache.move_to_end(key)
+            self.model.conds = cached[1]
+            log.debug(f"Using cached conditionals for {audio_prompt_path}")
+            return
+
+        with torch.inference_mode():
+            self.model.prepare_conditionals(audio_prompt_path, exaggeration=exaggeration, norm_loudness=norm_loudness)
 
-        return str(full_path)
+        self._cond_cache[key] = (now, self.model.conds)
+        self._cond_cache.move_to_end(key)
+        while len(self._cond_cache) > config.COND_CACHE_SIZE:
+            self._cond_cache.popitem(last=False)
+
+    def process_audio_prompt(self, audio_prompt_path: str) -> str:
+        """Process and validate audio reference for voice cloning"""
+        return self._resolve_audio_prompt(audio_prompt_path)[0]
+
+    def _resolve_audio_prompt(self, audio_prompt_path: str) -> Tuple[str, tuple]:
+        """Validate an audio prompt and return (resolved path, file version key)
+
+        Costs one stat per request; everything else is cached per file version.
+        The (path, mtime, size) version key also keys the conditionals cache.
+        """
+        if not audio_prompt_path:
+            return None, None
+
+        # Security check: reject '..' escapes lexically before touching the filesystem
+        # (symlinks are resolved and re-checked in _validate_audio_prompt)
+        full_path = os.path.normpath(os.path.join(_PROMPTS_DIR, audio_prompt_path))
+        if os.path.commonpath([full_path, _PROMPTS_DIR]) != _PROMPTS_DIR:
+            raise ValueError("Invalid audio_prompt path: Path traversal detected")
+
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            raise ValueError(f"Audio prompt not found: {audio_prompt_path}")
+
+        version = (full_path, st.st_mtime_ns, st.st_size)
+        return _validate_audio_prompt(*version), version
+
+    def _synthesize(self, text, temperature, top_p, top_k, repetition_penalty):
+        """ChatterboxTurboTTS.generate minus its CPU watermarking tail
+
+        Mirrors upstream generate() from text tokens through S3Gen, so callers can
+        overlap the watermark with the next chunk. Expects conditionals to be set
+        and an inference_mode context. Returns the unwatermarked 1-D wav on device
+        and a CUDA event marking when it is ready (None on CPU), without waiting
+        for the vocoder kernels to finish.
+        """
+        # Norm and tokenize text
+        text_tokens = self.model.tokenizer(punc_norm(text), return_tensors="pt", padding=True, truncation=True)
+        text_tokens = text_tokens.input_ids.to(self.device)
+
+        speech_tokens = self.model.t3.inference_turbo(
+            t3_cond=self.model.conds.t3,
+            text_tokens=text_tokens,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            repetition_penalty=repetition_penalty,
+        )
+
+        # Remove OOV tokens and add silence to end
+        speech_tokens = speech_tokens[speech_tokens < 6561].to(self.device)
+        silence = torch.tensor([S3GEN_SIL, S3GEN_SIL, S3GEN_SIL], dtype=torch.long, device=self.device)
+        speech_tokens = torch.cat([speech_tokens, silence])
+
+        if self._vocoder_stream is None:
+            wav, _ = self.model.s3gen.inference(
+                speech_tokens=speech_tokens,
+                ref_dict=self.model.conds.gen,
+                n_cfm_timesteps=2,
+            )
+            return wav.squeeze(0).detach(), None
+
+        # Run S3Gen on a side stream so the next chunk's T3 decode (default stream)
+        # can start while this chunk's vocoder kernels are still executing
+        self._vocoder_stream.wait_stream(torch.cuda.current_stream())
+        speech_tokens.record_stream(self._vocoder_stream)
+        with torch.cuda.stream(self._vocoder_stream):
+            wav, _ = self.model.s3gen.inference(
+                speech_tokens=speech_tokens,
+                ref_dict=self.model.conds.gen,
+                n_cfm_timesteps=2,
+            )
+            ready = torch.cuda.Event()
+            ready.record()
+        return wav.squeeze(0).detach(), ready
+
+    def _watermark(self, wav: torch.Tensor, ready) -> np.ndarray:
+        """Copy a synthesized chunk to the host and apply the Perth watermark (runs on _WATERMARK_POOL)"""
+        if ready is not None:
+            ready.synchronize()
+        # Grad mode is thread-local, so the caller's inference_mode doesn't cover this thread
+        with torch.inference_mode():
+            return self.model.watermarker.apply_watermark(wav.cpu().numpy(), sample_rate=self.model.sr)
 
     def generate(
         self,
         text,
-        repetition_penalty=1.2,
-        min_p=0.00,
-        top_p=0.95,
+        repetition_penalty=config.DEFAULT_REPETITION_PENALTY,
+        min_p=config.DEFAULT_MIN_P,
+        top_p=config.DEFAULT_TOP_P,
         audio_prompt=None,
-        exaggeration=0.0,
-        cfg_weight=0.0,
-        temperature=0.8,
-        top_k=1000,
-        norm_loudness=True,
+        exaggeration=config.DEFAULT_EXAGGERATION,
+        cfg_weight=config.DEFAULT_CFG_WEIGHT,
+        temperature=config.DEFAULT_TEMPERATURE,
+        top_k=config.DEFAULT_TOP_K,
+        norm_loudness=config.DEFAULT_NORM_LOUDNESS,
     ):
         """Generate audio from text using ChatterboxTurboTTS with smart chunking
 
@@ -417,28 +933,33 @@ class ChatterBoxInference:
         log.info(f"Generating audio for text ({len(text)} chars): {text[:50]}...")
 
         # Process audio prompt if provided
-        audio_prompt_path = self.process_audio_prompt(audio_prompt)
+        audio_prompt_path, prompt_version = self._resolve_audio_prompt(audio_prompt)
+
+        # Conditionals are prepared (or fetched from cache) once, then reused by every chunk
+        self._set_conditionals(audio_prompt_path, prompt_version, exaggeration, norm_loudness)
 
         # ChatterBox requires either audio_prompt_path or pre-prepared conditionals
-        if not audio_prompt_path and self.model.conds is None:
+        if self.model.conds is None:
             raise ValueError(
                 "Either 'audio_prompt' must be provided for voice cloning, "
                 "or model must have pre-prepared conditionals"
             )
 
+        top_k = int(top_k)  # Cast once rather than per chunk
+
         # Smart chunk text if it's too long
         chunks = self._smart_chunk_text(text, self.max_chunk_chars)
 
         if len(chunks) == 1:
             # Single chunk, generate directly
-            with torch.no_grad():
+            with torch.inference_mode(), self._autocast():
                 wav = self.model.generate(
                     text,
-                    audio_prompt_path=audio_prompt_path,
+                    audio_prompt_path=None,
                     temperature=temperature,
                     min_p=min_p,
                     top_p=top_p,
-                    top_k=int(top_k),
+                    top_k=top_k,
                     repetition_penalty=repetition_penalty,
                     norm_loudness=norm_loudness,
                     exaggeration=exaggeration,
@@ -446,30 +967,45 @@ class ChatterBoxInference:
                 )
             return wav
         else:
-            # Multiple chunks, generate and concatenate
+            # Multiple chunks: T3 can't batch texts, so pipeline instead. The GPU
+            # synthesizes chunk i+1 while chunk i is copied back and watermarked on the
+            # CPU; the device-to-host copy happens on the watermark thread, so this
+            # loop never waits for a chunk's vocoder kernels before queueing the next.
             log.info(f"Processing {len(chunks)} chunks...")
+            if cfg_weight > 0.0 or exaggeration > 0.0 or min_p > 0.0:
+                log.warning("CFG, min_p and exaggeration are not supported by Turbo version and will be ignored.")
             audio_chunks = []
+            pending = []
 
-            with torch.no_grad():
+            with torch.inference_mode(), self._autocast():
                 for i, chunk_text in enumerate(chunks, 1):
                     log.info(f"Generating chunk {i}/{len(chunks)} ({len(chunk_text)} chars)...")
 
-                    chunk_wav = self.model.generate(
+                    if not self._pipeline_enabled:
+                        # Upstream generate() synthesizes and watermarks each chunk in turn
+                        chunk_wav = self.model.generate(
+                            chunk_text,
+                            audio_prompt_path=None,
+                            temperature=temperature,
+                            top_p=top_p,
+                            top_k=top_k,
+                            repetition_penalty=repetition_penalty,
+                            norm_loudness=norm_loudness,
+                        )
+                        audio_chunks.append(chunk_wav.squeeze(0).cpu().numpy())
+                        continue
+
+                    chunk_wav, ready = self._synthesize(
                         chunk_text,
-                        audio_prompt_path=audio_prompt_path,
                         temperature=temperature,
-                        min_p=min_p,
                         top_p=top_p,
-                        top_k=int(top_k),
+                        top_k=top_k,
                         repetition_penalty=repetition_penalty,
-                        norm_loudness=norm_loudness,
-                        exaggeration=exaggeration,
-                        cfg_weight=cfg_weight
                     )
+                    pending.append(_WATERMARK_POOL.submit(self._watermark, chunk_wav, ready))
 
-                    # Remove batch dimension and convert to numpy for concatenation
-                    chunk_audio = chunk_wav.squeeze(0).cpu().numpy()
-                    audio_chunks.append(chunk_audio)
+            # Only one of the two lists is filled, so chunk order is preserved
+            audio_chunks += [future.result() for future in pending]
 
             # Concatenate all audio chunks
             concatenated_audio = np.concatenate(audio_chunks, axis=0)
@@ -488,15 +1024,15 @@ class ChatterBoxInference:
     def generate_audio_stream(
         self,
         text: str,
-        repetition_penalty=1.2,
-        min_p=0.00,
-        top_p=0.95,
+        repetition_penalty=config.DEFAULT_REPETITION_PENALTY,
+        min_p=config.DEFAULT_MIN_P,
+        top_p=config.DEFAULT_TOP_P,
         audio_prompt=None,
-        exaggeration=0.0,
-        cfg_weight=0.0,
-        temperature=0.8,
-        top_k=1000,
-        norm_loudness=True,
+        exaggeration=config.DEFAULT_EXAGGERATION,
+        cfg_weight=config.DEFAULT_CFG_WEIGHT,
+        temperature=config.DEFAULT_TEMPERATURE,
+        top_k=config.DEFAULT_TOP_K,
+        norm_loudness=config.DEFAULT_NORM_LOUDNESS,
     ) -> Generator[torch.Tensor, None, None]:
         """
         Generate audio in chunks using the TTS model.
@@ -514,15 +1050,20 @@ class ChatterBoxInference:
             self.load_model()
 
         # Process audio prompt if provided
-        audio_prompt_path = self.process_audio_prompt(audio_prompt)
+        audio_prompt_path, prompt_version = self._resolve_audio_prompt(audio_prompt)
+
+        # Conditionals are prepared (or fetched from cache) once, then reused by every chunk
+        self._set_conditionals(audio_prompt_path, prompt_version, exaggeration, norm_loudness)
 
         # ChatterBox requires either audio_prompt_path or pre-prepared conditionals
-        if not audio_prompt_path and self.model.conds is None:
+        if self.model.conds is None:
             raise ValueError(
                 "Either 'audio_prompt' must be provided for voice cloning, "
                 "or model must have pre-prepared conditionals"
             )
 
+        top_k = int(top_k)  # Cast once rather than per chunk
+
         # Smart chunk text
         chunks = self._smart_chunk_text(text, self.max_chunk_chars)
 
@@ -531,14 +1072,14 @@ class ChatterBoxInference:
         for i, chunk_text in enumerate(chunks, 1):
             log.info(f"[Streaming] Generating chunk {i}/{len(chunks)} ({len(chunk_text)} chars)...")
 
-            with torch.no_grad():
+            with torch.inference_mode(), self._autocast():
                 chunk_wav = self.model.generate(
                     chunk_text,
-                    audio_prompt_path=audio_prompt_path,
+                    audio_prompt_path=None,
                     temperature=temperature,
                     min_p=min_p,
                     top_p=top_p,
-                    top_k=int(top_k),
+                    top_k=top_k,
                     repetition_penalty=repetition_penalty,
                     norm_loudness=norm_loudness,
                     exaggeration=exaggeration,
@@ -550,15 +1091,15 @@ class ChatterBoxInference:
     def generate_audio_stream_decoded(
         self,
         text: str,
-        repetition_penalty=1.2,
-        min_p=0.00,
-        top_p=0.95,
+        repetition_penalty=config.DEFAULT_REPETITION_PENALTY,
+        min_p=config.DEFAULT_MIN_P,
+        top_p=config.DEFAULT_TOP_P,
         audio_prompt=None,
-        exaggeration=0.0,
-        cfg_weight=0.0,
-        temperature=0.8,
-        top_k=1000,
-        norm_loudness=True,
+        exaggeration=config.DEFAULT_EXAGGERATION,
+        cfg_weight=config.DEFAULT_CFG_WEIGHT,
+        temperature=config.DEFAULT_TEMPERATURE,
+        top_k=config.DEFAULT_TOP_K,
+        norm_loudness=config.DEFAULT_NORM_LOUDNESS,
     ) -> Generator[Dict[str, Any], None, None]:
         """
         Generate streaming audio with LinaCodec compression then decode.